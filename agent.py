@@ -9,13 +9,26 @@ Monitor AWS resources through natural language using:
 
 Powered by Claude Sonnet 4.5, AgentCore Gateway with Semantic Search, and persistent memory.
 """
+import atexit
 import json
-import requests
+import httpx
 import logging
 import re
+import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Check if config exists
 if not Path('config.json').exists():
@@ -25,9 +38,17 @@ if not Path('config.json').exists():
 from strands import Agent
 from strands.models import BedrockModel
 from strands.tools.mcp.mcp_client import MCPClient
+from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import Tool
 from strands.hooks import AgentInitializedEvent, HookProvider, HookRegistry, MessageAddedEvent
-from bedrock_agentcore.memory import MemoryClient
+
+# Same atomic config.json writer the setup scripts use (the agent runs from the repo root)
+from setup._config import save_config
+
+if TYPE_CHECKING:
+    # Annotation only; the real import stays lazy in create_or_get_memory()
+    from bedrock_agentcore.memory import MemoryClient
 
 # Setup logging - only show errors
 logging.basicConfig(
@@ -51,31 +72,146 @@ CLIENT_ID = config['cognito']['client_id']
 CLIENT_SECRET = config['cognito']['client_secret']
 TOKEN_URL = config['cognito']['token_url']
 GATEWAY_URL = config['gateway']['url']
+GATEWAY_ID = config['gateway'].get('id')
+# Tool cache is only valid for the exact set of targets created by setup/03
+GATEWAY_TARGET_IDS = sorted(target['id'] for target in config.get('smithy_targets', []))
 REGION = config['aws'].get('region', 'us-east-1')
+MEMORY_BATCH_SIZE = 10  # Max messages written per create_event call
+MEMORY_FLUSH_INTERVAL = 0.25  # Seconds between background flushes of pending messages
+MEMORY_RECENT_TURNS = 5  # Conversation turns loaded into the system prompt
+MEMORY_EVENT_EXPIRY_DAYS = 30  # Keep conversation history for 30 days
+MEMORY_ACTIVE_POLL_INTERVAL = 5  # Seconds between status checks while a found memory is CREATING
+MEMORY_ACTIVE_TIMEOUT = 300  # Give up waiting on a CREATING memory after this many seconds
+MCP_KEEPALIVE_INTERVAL = 30  # Seconds of agent inactivity before pinging the gateway
+TOOLS_CACHE_FILE = Path.home() / '.cache' / 'aws-resource-optimizer' / 'tools.json'
+TOOLS_CACHE_TTL = 24 * 60 * 60  # Re-list gateway tools at most once a day
+RECENT_CONTEXT_FILE = Path.home() / '.cache' / 'aws-resource-optimizer' / 'recent.json'
 ACTOR_ID = "resource-optimizer-001"  # Unique identifier for this agent
 SESSION_ID = f"main-session-{ACTOR_ID}"  # Fixed session ID for memory continuity
 
+SYSTEM_PROMPT_TEMPLATE = """You are an AWS Resource Optimizer powered by Claude Sonnet 4.5 with persistent memory.
+
+WHAT YOU DO:
+Optimize and monitor AWS resources using three API targets:
+
+1. CloudWatch Metrics API:
+   - Monitor performance across ALL AWS services (EC2, RDS, Lambda, S3, EBS, etc.)
+   - Get metric statistics: CPU, memory, disk, network, invocations, errors
+   - List available metrics and analyze trends
+   - Identify underutilized or overutilized resources
+
+2. CloudWatch Logs API:
+   - Search and analyze log groups across services
+   - Filter log events for errors and patterns
+   - Analyze Lambda function logs, application logs, infrastructure logs
+   - Troubleshoot issues using log data
+
+3. EBS API:
+   - Manage EBS volumes and snapshots
+   - List snapshot blocks
+   - Optimize storage resources
+
+WHAT YOU DON'T HAVE:
+- NO direct EC2 API (use CloudWatch Metrics to monitor EC2 instances)
+- NO direct RDS API (use CloudWatch Metrics to monitor RDS databases)
+- NO direct Lambda API (use CloudWatch Metrics + Logs for Lambda monitoring)
+
+YOUR GOAL:
+Help users optimize AWS resource usage by:
+- Identifying idle or underutilized resources
+- Analyzing performance bottlenecks
+- Recommending cost optimizations
+- Troubleshooting issues via logs and metrics
+
+COMMUNICATION STYLE:
+- Be conversational and helpful
+- Use plain text only (NO markdown formatting like ** or __)
+- Provide specific values, thresholds, and actionable recommendations
+- Explain technical concepts in simple terms
+- Remember previous conversations and reference them when relevant
+
+IMPORTANT RULES:
+- ONLY call tools when users ask about metrics, logs, resources, or optimization
+- DO NOT call tools for greetings, names, or casual conversation
+- Answer memory questions WITHOUT calling any tools
+- Be honest about API limitations
+- Focus on optimization and actionable insights
+
+Today's date: {today}
+"""
+
+# Built once per process; the memory hook appends recent conversation at startup
+SYSTEM_PROMPT = SYSTEM_PROMPT_TEMPLATE.format(today=datetime.now().strftime('%Y-%m-%d'))
+
+# Welcome banner, written in one go when the chat starts
+BANNER = "\n".join([
+    "=" * 60,
+    "Welcome! I'm your AWS Resource Optimizer powered by",
+    "Claude Sonnet 4.5 with AgentCore Gateway & Semantic Search",
+    "\n" + "-" * 60,
+    "I optimize AWS resources using:",
+    "  📊 CloudWatch Metrics (Performance monitoring)",
+    "  📝 CloudWatch Logs (Log analysis)",
+    "  💾 EBS API (Volume & snapshot management)",
+    "\n" + "-" * 60,
+    "Try asking:",
+    "  • List available metrics for my resources",
+    "  • Show me underutilized resources",
+    "  • Analyze Lambda function performance",
+    "  • Search logs for errors",
+    "  • What did we discuss last time?",
+    "-" * 60,
+    "Type 'exit' to quit",
+    "=" * 60,
+])
+
+# Patterns for stripping <thinking> blocks (closed ones, plus an unclosed trailing one) from agent responses
+_THINK_RE = re.compile(r'<thinking>.*?</thinking>\s*|\s*<thinking>(?:(?!</thinking>).)*\Z', re.DOTALL | re.IGNORECASE)
+_RATE_LIMIT_RE = re.compile(r'rate limit|throttl', re.IGNORECASE)
+
+# Shared HTTP/2 client so token requests reuse one pooled TLS connection
+_HTTPX = httpx.Client(
+    timeout=httpx.Timeout(10.0, connect=3.05),
+    transport=httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        retries=3
+    )
+)
+atexit.register(_HTTPX.close)
+
+# Cached Cognito token, refreshed ~60s before it expires
+_TOKEN_CACHE = {'token': None, 'exp': 0}
+
 def fetch_access_token(client_id, client_secret, token_url):
-    """Get Cognito access token (following docs pattern)"""
-    response = requests.post(
+    """Get Cognito access token (following docs pattern), cached until shortly before expiry"""
+    if _TOKEN_CACHE['token'] and time.monotonic() < _TOKEN_CACHE['exp'] - 60:
+        return _TOKEN_CACHE['token']
+
+    response = _HTTPX.post(
         token_url,
-        data=f"grant_type=client_credentials&client_id={client_id}&client_secret={client_secret}",
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
+        data={'grant_type': 'client_credentials', 'client_id': client_id, 'client_secret': client_secret}
     )
-    return response.json()['access_token']
+    token_data = orjson.loads(response.content) if orjson is not None else response.json()
+    _TOKEN_CACHE['token'] = token_data['access_token']
+    _TOKEN_CACHE['exp'] = time.monotonic() + token_data.get('expires_in', 3600)
+    return _TOKEN_CACHE['token']
 
 def create_streamable_http_transport(mcp_url: str, access_token: str):
     """Create streamable HTTP transport (following docs pattern)"""
     return streamablehttp_client(mcp_url, headers={"Authorization": f"Bearer {access_token}"})
 
-def get_full_tools_list(client):
-    """List tools w/ support for pagination (following docs pattern)"""
+def get_full_tools_list(client, pagination_token=None):
+    """List tools w/ support for pagination (following docs pattern)
+
+    Tools with names over 64 characters (Bedrock limitation) are dropped as each page arrives.
+    Pass pagination_token to continue a listing that was started elsewhere.
+    """
     more_tools = True
     tools = []
-    pagination_token = None
     while more_tools:
         tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
-        tools.extend(tmp_tools)
+        tools.extend(tool for tool in tmp_tools if len(tool.tool_name) <= 64)
         if tmp_tools.pagination_token is None:
             more_tools = False
         else:
@@ -83,12 +219,158 @@ def get_full_tools_list(client):
             pagination_token = tmp_tools.pagination_token
     return tools
 
+def load_cached_tools(client):
+    """Rebuild tools from the local cache if it is fresh and belongs to this gateway"""
+    try:
+        cache = json.loads(TOOLS_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if cache.get('gateway_id') != GATEWAY_ID or cache.get('target_ids') != GATEWAY_TARGET_IDS:
+        return None
+    if time.time() - cache.get('fetched_at', 0) > TOOLS_CACHE_TTL or not cache.get('tools'):
+        return None
+
+    try:
+        return [MCPAgentTool(Tool.model_validate(tool), client) for tool in cache['tools']]
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable tools cache: {e}")
+        return None
+
+def save_tools_cache(tools):
+    """Persist the gateway tool definitions so the next start can skip listing them"""
+    if not tools:
+        # Targets may still be syncing; never pin an empty listing
+        return
+    try:
+        TOOLS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        TOOLS_CACHE_FILE.write_text(json.dumps({
+            'gateway_id': GATEWAY_ID,
+            'target_ids': GATEWAY_TARGET_IDS,
+            'fetched_at': time.time(),
+            'tools': [tool.mcp_tool.model_dump(mode='json') for tool in tools]
+        }))
+    except OSError as e:
+        logger.warning(f"Could not write tools cache: {e}")
+
+@lru_cache(maxsize=1)
+def load_gateway_tools(client):
+    """Gateway tools, memoized per client
+
+    The first page is always fetched live. If it is the only page it is the full listing;
+    otherwise the disk cache is used when it contains every tool on that page, and the
+    remaining pages are listed only when it doesn't.
+    """
+    first_page = client.list_tools_sync()
+    tools = [tool for tool in first_page if len(tool.tool_name) <= 64]
+
+    if first_page.pagination_token is not None:
+        cached = load_cached_tools(client)
+        if cached is not None and {t.tool_name for t in tools} <= {t.tool_name for t in cached}:
+            return tuple(cached)
+        tools.extend(get_full_tools_list(client, first_page.pagination_token))
+
+    save_tools_cache(tools)
+    return tuple(tools)
+
+# Field accessors for messages returned by get_last_k_turns
+_get_role = itemgetter('role')
+_get_content = itemgetter('content')
+
+def _normalize_role(role):
+    """Memory returns USER/ASSISTANT while strands messages use user/assistant; keep one casing"""
+    return role.upper()
+
 class CostMemoryHookProvider(HookProvider):
     """Memory hook for cost optimization agent - stores and retrieves conversation history"""
 
-    def __init__(self, memory_client: MemoryClient, memory_id: str):
+    def __init__(self, memory_client: "MemoryClient", memory_id: str):
         self.memory_client = memory_client
         self.memory_id = memory_id
+        self._pending = deque()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._recent_turns = []
+        self._actor_id = None
+        self._session_id = None
+        threading.Thread(target=self._write_loop, daemon=True).start()
+        atexit.register(self._flush)
+
+    def _write_loop(self):
+        """Flush pending messages every MEMORY_FLUSH_INTERVAL or as soon as a batch fills up"""
+        while True:
+            self._wakeup.wait(MEMORY_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self._flush()
+
+    def _flush(self):
+        """Write all pending messages, up to MEMORY_BATCH_SIZE per create_event call"""
+        with self._flush_lock:
+            saved = False
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(MEMORY_BATCH_SIZE, len(self._pending)))]
+                if self._save_messages(batch):
+                    self._track_turns(batch)
+                    saved = True
+            if saved:
+                # Keep the on-disk cache in step with what memory actually holds
+                self._save_recent_context()
+
+    def _track_turns(self, batch):
+        """Record written messages as turns (a user message starts a new turn) for the on-disk cache"""
+        for _, _, text, role in batch:
+            role = _normalize_role(role)
+            if role == "USER" or not self._recent_turns:
+                self._recent_turns.append([])
+            self._recent_turns[-1].append([role, text])
+        del self._recent_turns[:-MEMORY_RECENT_TURNS]
+
+    def _save_messages(self, batch):
+        """Write a batch of (actor_id, session_id, text, role) entries to memory; returns True on success"""
+        try:
+            actor_id, session_id = batch[0][0], batch[0][1]
+            self.memory_client.create_event(
+                memory_id=self.memory_id,
+                actor_id=actor_id,
+                session_id=session_id,
+                messages=[(text, role) for _, _, text, role in batch]
+            )
+            logger.debug(f"✅ {len(batch)} message(s) saved to memory")
+            return True
+        except Exception as e:
+            logger.error(f"Memory save error: {e}")
+            return False
+
+    def _load_recent_context(self, actor_id, session_id):
+        """Return cached recent turns for this memory and session, or None if missing or expired"""
+        try:
+            cache = json.loads(RECENT_CONTEXT_FILE.read_text())
+        except (OSError, ValueError):
+            return None
+
+        # A different memory (recreated, deleted to clear history, other account) invalidates the cache
+        if (cache.get('memory_id') != self.memory_id
+                or cache.get('actor_id') != actor_id or cache.get('session_id') != session_id):
+            return None
+        if time.time() - cache.get('saved_at', 0) > MEMORY_EVENT_EXPIRY_DAYS * 24 * 60 * 60:
+            return None
+        return cache.get('turns')
+
+    def _save_recent_context(self):
+        """Persist the last MEMORY_RECENT_TURNS turns so the next start skips the memory lookup"""
+        if not self._session_id:
+            return
+        try:
+            RECENT_CONTEXT_FILE.parent.mkdir(parents=True, exist_ok=True)
+            RECENT_CONTEXT_FILE.write_text(json.dumps({
+                'memory_id': self.memory_id,
+                'actor_id': self._actor_id,
+                'session_id': self._session_id,
+                'saved_at': time.time(),
+                'turns': self._recent_turns[-MEMORY_RECENT_TURNS:]
+            }))
+        except OSError as e:
+            logger.warning(f"Could not write recent conversation cache: {e}")
 
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """Load recent conversation history when agent starts"""
@@ -100,24 +382,28 @@ class CostMemoryHookProvider(HookProvider):
                 logger.warning("Missing actor_id or session_id in agent state")
                 return
 
-            # Load the last 5 conversation turns from memory
-            recent_turns = self.memory_client.get_last_k_turns(
-                memory_id=self.memory_id,
-                actor_id=actor_id,
-                session_id=session_id,
-                k=5
-            )
+            self._actor_id = actor_id
+            self._session_id = session_id
+
+            # Prefer the local cache; only hit the memory service when it is missing or stale
+            recent_turns = self._load_recent_context(actor_id, session_id)
+            if recent_turns is None:
+                # Load the last few conversation turns from memory
+                memory_turns = self.memory_client.get_last_k_turns(
+                    memory_id=self.memory_id,
+                    actor_id=actor_id,
+                    session_id=session_id,
+                    k=MEMORY_RECENT_TURNS
+                )
+                recent_turns = [
+                    [[_normalize_role(_get_role(message)), _get_content(message)['text']] for message in turn]
+                    for turn in memory_turns or []
+                ]
+            self._recent_turns = recent_turns
 
             if recent_turns:
                 # Format conversation history for context
-                context_messages = []
-                for turn in recent_turns:
-                    for message in turn:
-                        role = message['role']
-                        content = message['content']['text']
-                        context_messages.append(f"{role}: {content}")
-
-                context = "\n".join(context_messages)
+                context = "\n".join(f"{role}: {content}" for turn in recent_turns for role, content in turn)
                 # Add context to agent's system prompt
                 event.agent.system_prompt += f"\n\nRecent conversation:\n{context}"
                 logger.debug(f"✅ Loaded {len(recent_turns)} conversation turns from memory")
@@ -126,20 +412,17 @@ class CostMemoryHookProvider(HookProvider):
             logger.error(f"Memory load error: {e}")
 
     def on_message_added(self, event: MessageAddedEvent):
-        """Store messages in memory"""
+        """Queue messages for the background memory writer"""
         messages = event.agent.messages
         try:
             actor_id = event.agent.state.get("actor_id")
             session_id = event.agent.state.get("session_id")
 
             if messages[-1]["content"][0].get("text"):
-                self.memory_client.create_event(
-                    memory_id=self.memory_id,
-                    actor_id=actor_id,
-                    session_id=session_id,
-                    messages=[(messages[-1]["content"][0]["text"], messages[-1]["role"])]
-                )
-                logger.debug("✅ Message saved to memory")
+                text, role = messages[-1]["content"][0]["text"], messages[-1]["role"]
+                self._pending.append((actor_id, session_id, text, role))
+                if len(self._pending) >= MEMORY_BATCH_SIZE:
+                    self._wakeup.set()
         except Exception as e:
             logger.error(f"Memory save error: {e}")
 
@@ -148,19 +431,91 @@ class CostMemoryHookProvider(HookProvider):
         registry.add_callback(MessageAddedEvent, self.on_message_added)
         registry.add_callback(AgentInitializedEvent, self.on_agent_initialized)
 
+def wait_for_memory_active(memory_client, memory_id):
+    """Poll a CREATING memory until it is ACTIVE; False if it fails or MEMORY_ACTIVE_TIMEOUT passes"""
+    deadline = time.monotonic() + MEMORY_ACTIVE_TIMEOUT
+    while time.monotonic() < deadline:
+        status = memory_client.get_memory_status(memory_id)
+        if status == 'ACTIVE':
+            return True
+        if status != 'CREATING':
+            return False
+        time.sleep(MEMORY_ACTIVE_POLL_INTERVAL)
+    return False
+
+def find_memory(memory_client, memory_name):
+    """Page through memories and stop at the first ACTIVE one created under memory_name
+
+    FAILED/DELETING memories are skipped; a CREATING one is waited on if no ACTIVE one exists.
+    """
+    # Memory summaries carry no name; IDs are "<name>-<suffix>"
+    prefix = f"{memory_name}-"
+    request = {'maxResults': 100}
+    creating = None
+    while True:
+        response = memory_client.gmcp_client.list_memories(**request)
+        for memory in response.get('memories', []):
+            if not memory['id'].startswith(prefix):
+                continue
+            if memory.get('status') == 'ACTIVE':
+                return memory
+            if memory.get('status') == 'CREATING' and creating is None:
+                creating = memory
+        if not response.get('nextToken'):
+            break
+        request['nextToken'] = response['nextToken']
+
+    if creating is not None and wait_for_memory_active(memory_client, creating['id']):
+        return creating
+    return None
+
 def create_or_get_memory():
     """Create or retrieve AgentCore Memory for resource optimization"""
+    # Imported lazily: only needed once the gateway connection is up
+    import boto3
+    from botocore.config import Config
+    from bedrock_agentcore.memory import MemoryClient
+
     memory_client = MemoryClient(region_name=REGION)
+
+    # Event reads/writes go through the data-plane client: give it a larger pool with
+    # TCP keep-alive and adaptive retries, keeping the SDK's own client settings
+    data_plane = memory_client.gmdp_client
+    memory_client.gmdp_client = boto3.client(
+        'bedrock-agentcore',
+        region_name=data_plane.meta.region_name,
+        config=data_plane.meta.config.merge(Config(
+            max_pool_connections=32,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 8}
+        ))
+    )
     memory_name = "ResourceOptimizerMemory"
 
+    # Reuse the memory ID saved in config.json when it still resolves
+    cached_id = config.get('memory', {}).get('id')
+    if cached_id:
+        try:
+            status = memory_client.get_memory_status(cached_id)
+            if status == 'ACTIVE':
+                logger.debug(f"✅ Using cached memory: {cached_id}")
+                return memory_client, cached_id
+            logger.debug(f"Cached memory {cached_id} is {status}, searching")
+        except Exception as e:
+            logger.debug(f"Cached memory {cached_id} unavailable, searching: {e}")
+
     try:
         # Try to find existing memory
-        memories = memory_client.list_memories()
-        existing_memory = next((m for m in memories if m['id'].startswith(memory_name)), None)
+        existing_memory = find_memory(memory_client, memory_name)
 
         if existing_memory:
             memory_id = existing_memory['id']
             logger.debug(f"✅ Using existing memory: {memory_id}")
+
+            # Save memory ID to config so the next start skips the search
+            config['memory'] = {'id': memory_id, 'name': memory_name}
+            save_config(config)
+
             return memory_client, memory_id
 
         # Create new memory resource for short-term memory
@@ -169,15 +524,14 @@ def create_or_get_memory():
             name=memory_name,
             strategies=[],  # No strategies for short-term memory
             description="Short-term memory for AWS cost optimization conversations",
-            event_expiry_days=30,  # Keep conversation history for 30 days
+            event_expiry_days=MEMORY_EVENT_EXPIRY_DAYS,
         )
         memory_id = memory['id']
         logger.debug(f"✅ Created memory: {memory_id}")
 
         # Save memory ID to config
         config['memory'] = {'id': memory_id, 'name': memory_name}
-        with open('config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        save_config(config)
 
         return memory_client, memory_id
 
@@ -193,19 +547,19 @@ def create_resource_optimizer_agent():
 
     # Authenticate with Cognito
     print("🔐 Authenticating with gateway...")
-    access_token = fetch_access_token(CLIENT_ID, CLIENT_SECRET, TOKEN_URL)
+    fetch_access_token(CLIENT_ID, CLIENT_SECRET, TOKEN_URL)
     print("✅ Authentication successful")
 
     # Connect to AgentCore Gateway
     print("📡 Connecting to AgentCore Gateway...")
-    mcp_client = MCPClient(lambda: create_streamable_http_transport(GATEWAY_URL, access_token))
+    # Resolve the token per connection so reconnects pick up a refreshed one from the cache
+    mcp_client = MCPClient(lambda: create_streamable_http_transport(
+        GATEWAY_URL, fetch_access_token(CLIENT_ID, CLIENT_SECRET, TOKEN_URL)
+    ))
 
     with mcp_client:
-        # List available tools
-        all_tools = get_full_tools_list(mcp_client)
-
-        # Filter tools with names <= 64 characters (Bedrock limitation)
-        tools = [tool for tool in all_tools if len(tool.tool_name) <= 64]
+        # List available tools (first page live, the rest from the local cache when it still matches)
+        tools = list(load_gateway_tools(mcp_client))
 
         print(f"✅ Gateway connected ({len(tools)} tools available)")
 
@@ -225,56 +579,7 @@ def create_resource_optimizer_agent():
         # Create agent with MCP tools AND memory hooks (docs pattern)
         agent = Agent(
             name="ResourceOptimizerAgent",
-            system_prompt=f"""You are an AWS Resource Optimizer powered by Claude Sonnet 4.5 with persistent memory.
-
-WHAT YOU DO:
-Optimize and monitor AWS resources using three API targets:
-
-1. CloudWatch Metrics API:
-   - Monitor performance across ALL AWS services (EC2, RDS, Lambda, S3, EBS, etc.)
-   - Get metric statistics: CPU, memory, disk, network, invocations, errors
-   - List available metrics and analyze trends
-   - Identify underutilized or overutilized resources
-
-2. CloudWatch Logs API:
-   - Search and analyze log groups across services
-   - Filter log events for errors and patterns
-   - Analyze Lambda function logs, application logs, infrastructure logs
-   - Troubleshoot issues using log data
-
-3. EBS API:
-   - Manage EBS volumes and snapshots
-   - List snapshot blocks
-   - Optimize storage resources
-
-WHAT YOU DON'T HAVE:
-- NO direct EC2 API (use CloudWatch Metrics to monitor EC2 instances)
-- NO direct RDS API (use CloudWatch Metrics to monitor RDS databases)
-- NO direct Lambda API (use CloudWatch Metrics + Logs for Lambda monitoring)
-
-YOUR GOAL:
-Help users optimize AWS resource usage by:
-- Identifying idle or underutilized resources
-- Analyzing performance bottlenecks
-- Recommending cost optimizations
-- Troubleshooting issues via logs and metrics
-
-COMMUNICATION STYLE:
-- Be conversational and helpful
-- Use plain text only (NO markdown formatting like ** or __)
-- Provide specific values, thresholds, and actionable recommendations
-- Explain technical concepts in simple terms
-- Remember previous conversations and reference them when relevant
-
-IMPORTANT RULES:
-- ONLY call tools when users ask about metrics, logs, resources, or optimization
-- DO NOT call tools for greetings, names, or casual conversation
-- Answer memory questions WITHOUT calling any tools
-- Be honest about API limitations
-- Focus on optimization and actionable insights
-
-Today's date: {datetime.now().strftime('%Y-%m-%d')}
-""",
+            system_prompt=SYSTEM_PROMPT,
             model=bedrock_model,
             tools=tools,  # Pass ALL compatible MCP tools directly to the agent
             hooks=[CostMemoryHookProvider(memory_client, memory_id)],  # Add memory hooks
@@ -284,75 +589,119 @@ Today's date: {datetime.now().strftime('%Y-%m-%d')}
 
         return agent, mcp_client, memory_client, memory_id
 
+def _ping_gateway(mcp_client):
+    """Send an MCP ping over the client's background session"""
+    # strands' MCPClient has no public ping; reuse the session it drives on its own thread
+    # (private attributes, present from strands-agents 1.0 through at least 1.59)
+    session = mcp_client._background_thread_session
+    invoke = mcp_client._invoke_on_background_thread
+    if session is None:
+        raise RuntimeError("MCP session is not running")
+    invoke(session.send_ping()).result(timeout=10)
+
+def _keepalive(mcp_client, stop_event, activity):
+    """Ping the gateway after MCP_KEEPALIVE_INTERVAL seconds without agent activity"""
+    while not stop_event.wait(MCP_KEEPALIVE_INTERVAL):
+        if activity['busy'] or time.monotonic() - activity['last'] < MCP_KEEPALIVE_INTERVAL:
+            continue
+        try:
+            _ping_gateway(mcp_client)
+            activity['last'] = time.monotonic()
+        except (AttributeError, TypeError) as e:
+            # The strands internals the ping relies on changed: every later ping would fail the same way.
+            # Logged at ERROR because the logger is filtered at that level; WARNING would never show.
+            logger.error(f"Gateway keepalive disabled (incompatible strands MCPClient): {e}")
+            return
+        except Exception as e:
+            logger.debug(f"Gateway keepalive failed: {e}")
+
+def _call_agent(agent, user_input):
+    """Run the agent on a daemon thread and wait for it on the main thread
+
+    Ctrl-C interrupts the wait, and nothing joins the abandoned thread at exit.
+    """
+    future = Future()
+
+    def worker():
+        try:
+            future.set_result(agent(user_input))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=worker, daemon=True).start()
+    return future.result()
+
+def run_chat(agent, activity):
+    """Interactive chat loop; input() stays on the main thread, agent calls run on a daemon thread
+
+    activity ({'busy': bool, 'last': monotonic time}) tells the keepalive thread when the agent is working.
+    """
+    while True:
+        try:
+            user_input = input("\n👤 You: ").strip()
+            if user_input.lower() == "exit":
+                print("\nGoodbye! Keep monitoring those AWS resources! 👋")
+                break
+
+            if not user_input:
+                continue
+
+            # Call the agent - it will automatically use MCP tools as needed
+            activity['busy'] = True
+            try:
+                response = _call_agent(agent, user_input)
+            except KeyboardInterrupt:
+                # The abandoned call may still be touching the conversation, so don't start another one
+                print("\n\n⏹️  Request interrupted. Exiting...")
+                break
+            finally:
+                activity['busy'] = False
+                activity['last'] = time.monotonic()
+
+            # Remove thinking tags from response
+            if isinstance(response, str):
+                # Remove all <thinking>...</thinking> blocks (can appear multiple times) and any unclosed tail
+                cleaned_response = _THINK_RE.sub('', response).strip()
+
+                # Check if it's a rate limit error and provide helpful message
+                if _RATE_LIMIT_RE.search(cleaned_response):
+                    print(f"\n⚠️  AWS API rate limit reached.")
+                    print("💡 Wait a moment and try again, or ask about different resources.")
+                elif cleaned_response:
+                    print(f"\n🤖 Agent: {cleaned_response}")
+            else:
+                print(f"\n🤖 Agent: {response}")
+
+        except EOFError:
+            print("\n\nInput stream ended.")
+            break
+        except Exception as e:
+            error_message = str(e)
+            print(f"\nError: {error_message}")
+            if _RATE_LIMIT_RE.search(error_message):
+                print("💡 Try again in a few minutes - AWS has strict rate limits")
+            print("Please try a different question.")
+
 def main():
     """Main entry point"""
     try:
         # Create agent with MCP tools and memory
         agent, mcp_client, memory_client, memory_id = create_resource_optimizer_agent()
 
-        print("=" * 60)
-        print("Welcome! I'm your AWS Resource Optimizer powered by")
-        print("Claude Sonnet 4.5 with AgentCore Gateway & Semantic Search")
-        print("\n" + "-" * 60)
-        print("I optimize AWS resources using:")
-        print("  📊 CloudWatch Metrics (Performance monitoring)")
-        print("  📝 CloudWatch Logs (Log analysis)")
-        print("  💾 EBS API (Volume & snapshot management)")
-        print("\n" + "-" * 60)
-        print("Try asking:")
-        print("  • List available metrics for my resources")
-        print("  • Show me underutilized resources")
-        print("  • Analyze Lambda function performance")
-        print("  • Search logs for errors")
-        print("  • What did we discuss last time?")
-        print("-" * 60)
-        print("Type 'exit' to quit")
-        print("=" * 60)
+        sys.stdout.write(BANNER + "\n")
+        sys.stdout.flush()
 
         # CRITICAL: Agent must be used within MCP client context manager (docs requirement)
         with mcp_client:
-            # Interactive loop
-            while True:
-                try:
-                    user_input = input("\n👤 You: ")
-                    if user_input.lower() == "exit":
-                        print("\nGoodbye! Keep monitoring those AWS resources! 👋")
-                        break
-
-                    if not user_input.strip():
-                        continue
-
-                    # Call the agent - it will automatically use MCP tools as needed
-                    response = agent(user_input)
-
-                    # Remove thinking tags from response
-                    if isinstance(response, str):
-                        # Remove all <thinking>...</thinking> blocks (can appear multiple times)
-                        cleaned_response = re.sub(r'<thinking>.*?</thinking>\s*', '', response, flags=re.DOTALL | re.IGNORECASE)
-                        # Also remove any remaining thinking patterns
-                        cleaned_response = re.sub(r'\s*<thinking>.*', '', cleaned_response, flags=re.DOTALL | re.IGNORECASE)
-                        cleaned_response = cleaned_response.strip()
-
-                        # Check if it's a rate limit error and provide helpful message
-                        if 'rate limit' in cleaned_response.lower() or 'throttl' in cleaned_response.lower():
-                            print(f"\n⚠️  AWS API rate limit reached.")
-                            print("💡 Wait a moment and try again, or ask about different resources.")
-                        elif cleaned_response:
-                            print(f"\n🤖 Agent: {cleaned_response}")
-                    else:
-                        print(f"\n🤖 Agent: {response}")
-
-                except KeyboardInterrupt:
-                    print("\n\nExiting...")
-                    break
-                except EOFError:
-                    print("\n\nInput stream ended.")
-                    break
-                except Exception as e:
-                    print(f"\nError: {str(e)}")
-                    if "rate limit" in str(e).lower():
-                        print("💡 Try again in a few minutes - AWS has strict rate limits")
-                    print("Please try a different question.")
+            stop_event = threading.Event()
+            activity = {'busy': False, 'last': time.monotonic()}
+            threading.Thread(target=_keepalive, args=(mcp_client, stop_event, activity), daemon=True).start()
+            try:
+                run_chat(agent, activity)
+            except KeyboardInterrupt:
+                print("\n\nExiting...")
+            finally:
+                stop_event.set()
 
     except Exception as e:
         print(f"❌ Failed to initialize agent: {e}")
@@ -5,14 +5,22 @@ AWS Resource Optimizer Agent - AgentCore Runtime Edition
 Deployable to Amazon Bedrock AgentCore Runtime.
 Monitors AWS resources via CloudWatch Metrics, CloudWatch Logs, and EBS APIs.
 """
+import atexit
 import json
 import os
+import time
+from functools import lru_cache
 from bedrock_agentcore import BedrockAgentCoreApp
 from strands import Agent
 from strands.models import BedrockModel
 from strands.tools.mcp.mcp_client import MCPClient
 from mcp.client.streamable_http import streamablehttp_client
-import requests
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize AgentCore App
 app = BedrockAgentCoreApp()
@@ -23,35 +31,54 @@ COGNITO_CLIENT_ID = os.environ.get('COGNITO_CLIENT_ID')
 COGNITO_CLIENT_SECRET = os.environ.get('COGNITO_CLIENT_SECRET')
 COGNITO_TOKEN_URL = os.environ.get('COGNITO_TOKEN_URL')
 
+# Shared HTTP/2 client so token requests reuse one pooled TLS connection
+_HTTPX = httpx.Client(
+    timeout=httpx.Timeout(10.0, connect=3.05),
+    transport=httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        retries=3
+    )
+)
+atexit.register(_HTTPX.close)
+
+# Cached Cognito token, refreshed ~60s before it expires
+_TOKEN_CACHE = {'token': None, 'exp': 0}
+
 def get_access_token():
-    """Get Cognito OAuth token for gateway access"""
-    response = requests.post(
+    """Get Cognito OAuth token for gateway access, cached until shortly before expiry"""
+    if _TOKEN_CACHE['token'] and time.monotonic() < _TOKEN_CACHE['exp'] - 60:
+        return _TOKEN_CACHE['token']
+
+    response = _HTTPX.post(
         COGNITO_TOKEN_URL,
-        data=f"grant_type=client_credentials&client_id={COGNITO_CLIENT_ID}&client_secret={COGNITO_CLIENT_SECRET}",
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
+        data={'grant_type': 'client_credentials', 'client_id': COGNITO_CLIENT_ID, 'client_secret': COGNITO_CLIENT_SECRET}
     )
-    return response.json()['access_token']
+    token_data = orjson.loads(response.content) if orjson is not None else response.json()
+    _TOKEN_CACHE['token'] = token_data['access_token']
+    _TOKEN_CACHE['exp'] = time.monotonic() + token_data.get('expires_in', 3600)
+    return _TOKEN_CACHE['token']
 
 def create_transport():
-    """Create MCP transport"""
+    """Create MCP transport (called per connection, so each reconnect gets a current token)"""
     token = get_access_token()
     return streamablehttp_client(GATEWAY_URL, headers={"Authorization": f"Bearer {token}"})
 
+@lru_cache(maxsize=1)
 def get_tools():
-    """Load tools from gateway"""
+    """Load tools from gateway (memoized: repeat calls reuse the same client and tool list)"""
     mcp_client = MCPClient(create_transport)
     with mcp_client:
-        all_tools = []
+        tools = []
         pagination_token = None
         while True:
             result = mcp_client.list_tools_sync(pagination_token=pagination_token)
-            all_tools.extend(result)
+            # Filter tools (Bedrock limitation: <= 64 chars)
+            tools.extend(t for t in result if len(t.tool_name) <= 64)
             if result.pagination_token is None:
                 break
             pagination_token = result.pagination_token
 
-        # Filter tools (Bedrock limitation: <= 64 chars)
-        tools = [t for t in all_tools if len(t.tool_name) <= 64]
         return tools, mcp_client
 
 # Initialize agent with tools
@@ -4,113 +4,128 @@ Create IAM Role for Resource Optimizer Gateway
 Following AWS best practices for AgentCore Gateway
 """
 import boto3
+from botocore.config import Config
 import json
 import sys
 
+from _config import save_config
+
+# Trust policy - allows AgentCore Gateway to assume this role
+TRUST_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {
+                "Service": "bedrock-agentcore.amazonaws.com"
+            },
+            "Action": "sts:AssumeRole"
+        }
+    ]
+}
+
+# Permissions policy - what the gateway can do
+PERMISSIONS_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Sid": "EC2ResourceAccess",
+            "Effect": "Allow",
+            "Action": [
+                "ec2:DescribeInstances",
+                "ec2:DescribeVolumes",
+                "ec2:DescribeSnapshots",
+                "ec2:DescribeAddresses",
+                "ec2:DescribeImages",
+                "ec2:DescribeSecurityGroups",
+                "ec2:DescribeNetworkInterfaces",
+                "ec2:DescribeInstanceTypes",
+                "ec2:DescribeRegions"
+            ],
+            "Resource": "*"
+        },
+        {
+            "Sid": "EBSResourceAccess",
+            "Effect": "Allow",
+            "Action": [
+                "ebs:ListSnapshotBlocks",
+                "ebs:ListChangedBlocks",
+                "ebs:GetSnapshotBlock"
+            ],
+            "Resource": "*"
+        },
+        {
+            "Sid": "RDSResourceAccess",
+            "Effect": "Allow",
+            "Action": [
+                "rds:DescribeDBInstances",
+                "rds:DescribeDBSnapshots",
+                "rds:DescribeDBClusters",
+                "rds:ListTagsForResource"
+            ],
+            "Resource": "*"
+        },
+        {
+            "Sid": "CloudWatchMetrics",
+            "Effect": "Allow",
+            "Action": [
+                "cloudwatch:GetMetricStatistics",
+                "cloudwatch:ListMetrics",
+                "cloudwatch:GetMetricData"
+            ],
+            "Resource": "*"
+        },
+        {
+            "Sid": "CloudWatchLogs",
+            "Effect": "Allow",
+            "Action": [
+                "logs:DescribeLogGroups",
+                "logs:DescribeLogStreams",
+                "logs:GetLogEvents",
+                "logs:FilterLogEvents"
+            ],
+            "Resource": "*"
+        },
+        {
+            "Sid": "S3SmithySpecAccess",
+            "Effect": "Allow",
+            "Action": [
+                "s3:GetObject",
+                "s3:ListBucket"
+            ],
+            "Resource": [
+                "arn:aws:s3:::cost-explorer-smithy-api",
+                "arn:aws:s3:::cost-explorer-smithy-api/*"
+            ]
+        }
+    ]
+}
+
+# Serialized once and shared by the create and already-exists paths
+_TRUST_POLICY_JSON = json.dumps(TRUST_POLICY)
+_PERMISSIONS_POLICY_JSON = json.dumps(PERMISSIONS_POLICY)
+
 def create_gateway_role():
     """Create IAM role for AgentCore Gateway with resource optimizer permissions"""
 
-    iam_client = boto3.client('iam')
+    # One session/config shared by all clients (single credential + endpoint resolution)
+    session = boto3.Session()
+    client_config = Config(max_pool_connections=20, retries={'max_attempts': 5, 'mode': 'adaptive'})
+    iam_client = session.client('iam', config=client_config)
+    sts_client = session.client('sts', config=client_config)
     role_name = 'ResourceOptimizerGatewayRole'
 
-    # Trust policy - allows AgentCore Gateway to assume this role
-    trust_policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Principal": {
-                    "Service": "bedrock-agentcore.amazonaws.com"
-                },
-                "Action": "sts:AssumeRole"
-            }
-        ]
-    }
-
-    # Permissions policy - what the gateway can do
-    permissions_policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Sid": "EC2ResourceAccess",
-                "Effect": "Allow",
-                "Action": [
-                    "ec2:DescribeInstances",
-                    "ec2:DescribeVolumes",
-                    "ec2:DescribeSnapshots",
-                    "ec2:DescribeAddresses",
-                    "ec2:DescribeImages",
-                    "ec2:DescribeSecurityGroups",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DescribeInstanceTypes",
-                    "ec2:DescribeRegions"
-                ],
-                "Resource": "*"
-            },
-            {
-                "Sid": "EBSResourceAccess",
-                "Effect": "Allow",
-                "Action": [
-                    "ebs:ListSnapshotBlocks",
-                    "ebs:ListChangedBlocks",
-                    "ebs:GetSnapshotBlock"
-                ],
-                "Resource": "*"
-            },
-            {
-                "Sid": "RDSResourceAccess",
-                "Effect": "Allow",
-                "Action": [
-                    "rds:DescribeDBInstances",
-                    "rds:DescribeDBSnapshots",
-                    "rds:DescribeDBClusters",
-                    "rds:ListTagsForResource"
-                ],
-                "Resource": "*"
-            },
-            {
-                "Sid": "CloudWatchMetrics",
-                "Effect": "Allow",
-                "Action": [
-                    "cloudwatch:GetMetricStatistics",
-                    "cloudwatch:ListMetrics",
-                    "cloudwatch:GetMetricData"
-                ],
-                "Resource": "*"
-            },
-            {
-                "Sid": "CloudWatchLogs",
-                "Effect": "Allow",
-                "Action": [
-                    "logs:DescribeLogGroups",
-                    "logs:DescribeLogStreams",
-                    "logs:GetLogEvents",
-                    "logs:FilterLogEvents"
-                ],
-                "Resource": "*"
-            },
-            {
-                "Sid": "S3SmithySpecAccess",
-                "Effect": "Allow",
-                "Action": [
-                    "s3:GetObject",
-                    "s3:ListBucket"
-                ],
-                "Resource": [
-                    "arn:aws:s3:::cost-explorer-smithy-api",
-                    "arn:aws:s3:::cost-explorer-smithy-api/*"
-                ]
-            }
-        ]
-    }
-
     print(f"Creating IAM role: {role_name}")
 
     try:
+        # Looked up once, inside the try so STS failures report and exit like any other error;
+        # the already-exists branch below reuses it to build the role ARN
+        account_id = sts_client.get_caller_identity()['Account']
+
         # Create the role
         role_response = iam_client.create_role(
             RoleName=role_name,
-            AssumeRolePolicyDocument=json.dumps(trust_policy),
+            AssumeRolePolicyDocument=_TRUST_POLICY_JSON,
             Description='IAM role for CloudWatch Monitoring AgentCore Gateway - monitors AWS resources via CloudWatch, EBS, and Logs',
             MaxSessionDuration=3600
         )
@@ -123,7 +138,7 @@ def create_gateway_role():
         iam_client.put_role_policy(
             RoleName=role_name,
             PolicyName='ResourceOptimizerPermissions',
-            PolicyDocument=json.dumps(permissions_policy)
+            PolicyDocument=_PERMISSIONS_POLICY_JSON
         )
         print(f"✅ Permissions attached")
 
@@ -134,18 +149,13 @@ def create_gateway_role():
         except FileNotFoundError:
             config = {"aws": {}}
 
-        # Get account ID
-        sts_client = boto3.client('sts')
-        account_id = sts_client.get_caller_identity()['Account']
-
         config['aws'] = {
             'account_id': account_id,
             'gateway_role_arn': role_arn,
-            'region': boto3.Session().region_name or 'us-east-1'
+            'region': session.region_name or 'us-east-1'
         }
 
-        with open('config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        save_config(config)
 
         print(f"✅ Config updated")
 
@@ -157,14 +167,14 @@ def create_gateway_role():
 
     except iam_client.exceptions.EntityAlreadyExistsException:
         print(f"⚠️  Role {role_name} already exists")
-        role_arn = f"arn:aws:iam::{boto3.client('sts').get_caller_identity()['Account']}:role/{role_name}"
+        role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
 
         # Update policy anyway
         print(f"Updating permissions policy...")
         iam_client.put_role_policy(
             RoleName=role_name,
             PolicyName='ResourceOptimizerPermissions',
-            PolicyDocument=json.dumps(permissions_policy)
+            PolicyDocument=_PERMISSIONS_POLICY_JSON
         )
         print(f"✅ Permissions updated")
 
@@ -184,10 +194,13 @@ if __name__ == "__main__":
 
     result = create_gateway_role()
 
-    print("\n" + "=" * 60)
-    print("✅ IAM ROLE SETUP COMPLETE")
-    print("=" * 60)
-    print(f"Role Name: {result['role_name']}")
-    print(f"Role ARN:  {result['role_arn']}")
-    print("=" * 60)
-    print("\n🎯 Next: Run 02-create-cognito-auth.py")
\ No newline at end of file
+    sys.stdout.write("\n".join([
+        "\n" + "=" * 60,
+        "✅ IAM ROLE SETUP COMPLETE",
+        "=" * 60,
+        f"Role Name: {result['role_name']}",
+        f"Role ARN:  {result['role_arn']}",
+        "=" * 60,
+        "\n🎯 Next: Run 02-create-cognito-auth.py",
+    ]) + "\n")
+    sys.stdout.flush()
\ No newline at end of file
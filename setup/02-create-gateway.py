@@ -7,6 +7,8 @@ import boto3
 import json
 import sys
 
+from _config import save_config
+
 def create_gateway_with_semantic_search():
     """Create AgentCore Gateway with semantic search enabled"""
 
@@ -79,8 +81,7 @@ def create_gateway_with_semantic_search():
             'name': gateway_name
         }
 
-        with open('config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        save_config(config)
 
         print(f"\n✅ Configuration updated")
 
@@ -101,14 +102,17 @@ if __name__ == "__main__":
 
     result = create_gateway_with_semantic_search()
 
-    print("\n" + "=" * 60)
-    print("✅ GATEWAY SETUP COMPLETE")
-    print("=" * 60)
-    print(f"Gateway Name: {result['gateway_name']}")
-    print(f"Gateway ID:   {result['gateway_id']}")
-    print(f"Gateway URL:  {result['gateway_url']}")
-    print(f"Features:")
-    print(f"  ✓ Semantic Search (intelligent tool discovery)")
-    print(f"  ✓ Debug Mode (detailed error messages)")
-    print("=" * 60)
-    print("\n🎯 Next: Run 03-create-smithy-target.py")
\ No newline at end of file
+    sys.stdout.write("\n".join([
+        "\n" + "=" * 60,
+        "✅ GATEWAY SETUP COMPLETE",
+        "=" * 60,
+        f"Gateway Name: {result['gateway_name']}",
+        f"Gateway ID:   {result['gateway_id']}",
+        f"Gateway URL:  {result['gateway_url']}",
+        "Features:",
+        "  ✓ Semantic Search (intelligent tool discovery)",
+        "  ✓ Debug Mode (detailed error messages)",
+        "=" * 60,
+        "\n🎯 Next: Run 03-create-smithy-target.py",
+    ]) + "\n")
+    sys.stdout.flush()
\ No newline at end of file
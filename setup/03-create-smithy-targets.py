@@ -3,135 +3,232 @@
 Create All Smithy Targets for Resource Optimizer
 Creates CloudWatch, CloudWatch Logs, and EBS targets
 """
-import boto3
+import functools
+import io
 import json
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from _config import save_config
+
+@functools.cache
+def _session():
+    """One boto3 session per process; boto3 is imported on first use, not at module import"""
+    import boto3
+    return boto3.session.Session()
+
+@functools.cache
+def _control_client(region='us-east-1'):
+    """AgentCore control-plane client, built once per region"""
+    from botocore.config import Config
+
+    # Pool sized for the concurrent target creations; adaptive (rate-aware) retries are the only
+    # retry layer, so throttled creates back off inside botocore rather than in a loop on top of it
+    config = Config(max_pool_connections=8, retries={'mode': 'adaptive', 'max_attempts': 10})
+    return _session().client('bedrock-agentcore-control', region_name=region, config=config)
+
+@dataclass(frozen=True, slots=True)
+class TargetSpec:
+    """Smithy target definition; the model file is `key` in the specs bucket"""
+    name: str
+    key: str
+    description: str
+    size: str
+
+    def uri(self, bucket):
+        """S3 URI of this target's Smithy model"""
+        return f's3://{bucket}/{self.key}'
+
+S3_BUCKET = 'cost-explorer-smithy-api'
+
+# Existing targets are only reused in these states; FAILED, *_UNSUCCESSFUL and DELETING ones are not
+REUSABLE_TARGET_STATUSES = ('READY', 'CREATING', 'UPDATING', 'SYNCHRONIZING')
+
+# All targets to create
+TARGETS = (
+    TargetSpec('CloudWatchTarget', 'cloudwatch-2010-08-01.json',
+               'CloudWatch Metrics for monitoring all AWS resources', '371KB'),
+    TargetSpec('CloudWatchLogsTarget', 'cloudwatch-logs-2014-03-28.json',
+               'CloudWatch Logs for log analysis and monitoring', '645KB'),
+    TargetSpec('EBSTarget', 'ebs-2019-11-02.json',
+               'EBS for volume and snapshot management', '91KB'),
+)
+
+def smithy_target_configuration(uri):
+    """MCP target configuration for a Smithy model stored in S3"""
+    return {"mcp": {"smithyModel": {"s3": {"uri": uri}}}}
+
+def list_gateway_targets(client, gateway_id):
+    """Map target name -> target summary for every target on the gateway"""
+    return {
+        target['name']: target
+        for page in client.get_paginator('list_gateway_targets').paginate(gatewayIdentifier=gateway_id)
+        for target in page['items']
+    }
+
+def record_existing_target(target, target_ids):
+    """Record an existing target's ID in target_ids if it is reusable; returns the line to report"""
+    if target.get('status') in REUSABLE_TARGET_STATUSES:
+        target_ids[target['name']] = target['targetId']
+        return f"⏭️  {target['name']} already exists: {target['targetId']}"
+    return (f"⚠️  {target['name']} exists but is {target.get('status')}: {target['targetId']}\n"
+            f"   Not reused: delete it (or let its deletion finish) and rerun this script")
 
 def create_all_smithy_targets():
-    """Create all Smithy targets in one go"""
+    """Create all Smithy targets in one go
+
+    Returns (targets, created_names): every usable target in config order, and the names
+    of those created by this run (the rest were reused from a previous run).
+    """
 
     # Load configuration
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
+        # Binary mode: one read of raw bytes, no text decoding before parsing
+        with open('config.json', 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
     except FileNotFoundError:
         print("❌ config.json not found. Run previous setup scripts first")
         sys.exit(1)
 
     gateway_id = config['gateway']['id']
-    s3_bucket = 'cost-explorer-smithy-api'
+    s3_bucket = S3_BUCKET
 
-    print(f"Creating Smithy Targets for Gateway: {gateway_id}")
-    print(f"Using S3 bucket: {s3_bucket}")
+    # Progress output is buffered and written in one go when the function exits (even on error)
+    out = io.StringIO()
+    out.write(f"Creating Smithy Targets for Gateway: {gateway_id}\n")
+    out.write(f"Using S3 bucket: {s3_bucket}\n")
+    try:
+        from botocore.exceptions import BotoCoreError, ClientError
 
-    client = boto3.client('bedrock-agentcore-control', region_name='us-east-1')
+        client = _control_client()
 
-    # Credential configuration - use Gateway's IAM role
-    credential_config = {
-        "credentialProviderType": "GATEWAY_IAM_ROLE"
-    }
+        # Credential configuration - use Gateway's IAM role (shared by every target; botocore accepts a tuple)
+        credential_configs = (
+            {"credentialProviderType": "GATEWAY_IAM_ROLE"},
+        )
 
-    # Define all targets to create
-    targets_to_create = [
-        {
-            'name': 'CloudWatchTarget',
-            'uri': f's3://{s3_bucket}/cloudwatch-2010-08-01.json',
-            'description': 'CloudWatch Metrics for monitoring all AWS resources',
-            'size': '371KB'
-        },
-        {
-            'name': 'CloudWatchLogsTarget',
-            'uri': f's3://{s3_bucket}/cloudwatch-logs-2014-03-28.json',
-            'description': 'CloudWatch Logs for log analysis and monitoring',
-            'size': '645KB'
-        },
-        {
-            'name': 'EBSTarget',
-            'uri': f's3://{s3_bucket}/ebs-2019-11-02.json',
-            'description': 'EBS for volume and snapshot management',
-            'size': '91KB'
-        }
-    ]
-
-    created_targets = []
-
-    print("\n" + "=" * 60)
-    print("Creating Targets")
-    print("=" * 60)
+        created_targets = []
 
-    for target_spec in targets_to_create:
-        smithy_config = {
-            "mcp": {
-                "smithyModel": {
-                    "s3": {
-                        "uri": target_spec['uri']
-                    }
-                }
-            }
-        }
+        out.write("\n" + "=" * 60 + "\n")
+        out.write("Creating Targets\n")
+        out.write("=" * 60 + "\n")
 
+        # Targets already on the gateway (e.g. from a previous run) are reused, not re-created
         try:
-            print(f"\n🔧 Creating: {target_spec['name']} ({target_spec['size']})")
-            print(f"   URI: {target_spec['uri']}")
-
-            response = client.create_gateway_target(
-                gatewayIdentifier=gateway_id,
-                name=target_spec['name'],
-                description=target_spec['description'],
-                targetConfiguration=smithy_config,
-                credentialProviderConfigurations=[credential_config]
-            )
-
-            target_id = response['targetId']
-            print(f"   ✅ Created: {target_id}")
-
-            created_targets.append({
-                'id': target_id,
-                'name': target_spec['name'],
-                'uri': target_spec['uri'],
-                'description': target_spec['description']
-            })
-
-            # Small delay between target creations
-            time.sleep(2)
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            continue
-
-    if created_targets:
-        # Update configuration
-        config['smithy_targets'] = created_targets
-
-        with open('config.json', 'w') as f:
-            json.dump(config, f, indent=2)
-
-        print(f"\n✅ Configuration updated with {len(created_targets)} targets")
+            existing = list_gateway_targets(client, gateway_id)
+        except (ClientError, BotoCoreError) as e:
+            out.write(f"\n❌ Error listing targets for gateway {gateway_id}: {e}\n")
+            out.write("   Check that config.json points at an existing gateway (rerun 02-create-gateway.py)\n")
+            sys.exit(1)
+
+        target_ids = {}
+        created_names = []
+        conflicts = []
+        for target_spec in TARGETS:
+            if target_spec.name in existing:
+                out.write(f"\n{record_existing_target(existing[target_spec.name], target_ids)}\n")
+
+        # Create the remaining targets concurrently (boto3 clients are thread-safe for API calls)
+        with ThreadPoolExecutor(max_workers=len(TARGETS)) as executor:
+            futures = {
+                executor.submit(
+                    client.create_gateway_target,
+                    gatewayIdentifier=gateway_id,
+                    name=target_spec.name,
+                    description=target_spec.description,
+                    targetConfiguration=smithy_target_configuration(target_spec.uri(s3_bucket)),
+                    credentialProviderConfigurations=credential_configs
+                ): target_spec
+                for target_spec in TARGETS
+                if target_spec.name not in existing
+            }
 
-    return created_targets
+            for future in as_completed(futures):
+                target_spec = futures[future]
+                try:
+                    target_ids[target_spec.name] = future.result()['targetId']
+                    created_names.append(target_spec.name)
+                    status = f"   ✅ Created: {target_ids[target_spec.name]}"
+                except ClientError as e:
+                    if e.response['Error']['Code'] == 'ConflictException':
+                        conflicts.append(target_spec)
+                        status = "   ⚠️  Already exists (created since the target list was read)"
+                    else:
+                        status = f"   ❌ Error: {e}"
+                except BotoCoreError as e:
+                    # Timeouts / connection errors: report per target so the others still reach config.json
+                    status = f"   ❌ Error: {e}"
+
+                out.write(f"\n🔧 {target_spec.name} ({target_spec.size})\n"
+                          f"   URI: {target_spec.uri(s3_bucket)}\n"
+                          f"{status}\n")
+
+        # Targets that appeared while creating: look up their IDs so they still reach config.json
+        if conflicts:
+            try:
+                current = list_gateway_targets(client, gateway_id)
+            except (ClientError, BotoCoreError) as e:
+                current = {}
+                out.write(f"\n❌ Error re-listing targets: {e}\n")
+            for target_spec in conflicts:
+                if target_spec.name in current:
+                    out.write(f"\n{record_existing_target(current[target_spec.name], target_ids)}\n")
+                else:
+                    out.write(f"\n⚠️  {target_spec.name} conflicted but was not found; rerun this script\n")
+
+        # Keep config order stable regardless of completion order
+        for target_spec in TARGETS:
+            if target_spec.name in target_ids:
+                created_targets.append({
+                    'id': target_ids[target_spec.name],
+                    'name': target_spec.name,
+                    'uri': target_spec.uri(s3_bucket),
+                    'description': target_spec.description
+                })
+
+        if created_targets:
+            # Update configuration
+            config['smithy_targets'] = created_targets
+
+            save_config(config)
+
+            out.write(f"\n✅ Configuration updated with {len(created_targets)} targets\n")
+
+        return created_targets, created_names
+    finally:
+        sys.stdout.write(out.getvalue())
 
 if __name__ == "__main__":
     print("=" * 60)
     print("Creating All Smithy Targets")
     print("=" * 60)
 
-    results = create_all_smithy_targets()
+    results, created_names = create_all_smithy_targets()
 
     if results:
-        print("\n" + "=" * 60)
-        print("✅ SMITHY TARGETS SETUP COMPLETE")
-        print("=" * 60)
-        print(f"Created {len(results)} targets:")
-        for target in results:
-            print(f"  • {target['name']}: {target['id']}")
-        print("\nServices Available:")
-        print("  ✓ CloudWatch (Metrics for EC2, RDS, Lambda, etc.)")
-        print("  ✓ CloudWatch Logs (Log Analysis)")
-        print("  ✓ EBS (Volume Management)")
-        print("=" * 60)
-        print("\n⏰ Wait 60 seconds for tools to sync, then run:")
-        print("   python3 agent.py")
+        sys.stdout.write("\n".join([
+            "\n" + "=" * 60,
+            "✅ SMITHY TARGETS SETUP COMPLETE",
+            "=" * 60,
+            f"Created {len(created_names)} targets, reused {len(results) - len(created_names)} existing:",
+            *(f"  • {target['name']}: {target['id']}"
+              f"{'' if target['name'] in created_names else ' (reused)'}" for target in results),
+            "\nServices Available:",
+            "  ✓ CloudWatch (Metrics for EC2, RDS, Lambda, etc.)",
+            "  ✓ CloudWatch Logs (Log Analysis)",
+            "  ✓ EBS (Volume Management)",
+            "=" * 60,
+            "\n⏰ Wait 60 seconds for tools to sync, then run:",
+            "   python3 agent.py",
+        ]) + "\n")
+        sys.stdout.flush()
     else:
-        print("\n❌ No targets were created")
+        print("\n❌ No usable targets on the gateway")
         sys.exit(1)
\ No newline at end of file
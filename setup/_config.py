@@ -0,0 +1,24 @@
+"""
+Shared config.json helpers for the setup scripts and agent.py
+"""
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def save_config(config):
+    """Write config.json atomically (temp file + rename) so a crash never leaves it truncated
+
+    Always indented: users copy values out of the file by hand (see README).
+    """
+    if orjson is not None:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(config, indent=2).encode()
+    tmp_path = Path('config.json.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, 'config.json')